@@ -1,9 +1,19 @@
 import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 import json
-import time
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
-from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
+
+# orjson is much faster at parsing/serializing large lesson files.
+# Fall back to the stdlib json module if the wheel isn't installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # 1. Load Environment Variables
 # In GitHub Actions, these are injected from Secrets
@@ -13,7 +23,238 @@ EMAIL = os.getenv("NPOINT_EMAIL")
 PASSWORD = os.getenv("NPOINT_PASSWORD")
 REGISTRY_BIN_ID = os.getenv("REGISTRY_BIN_ID") 
 
-def run():
+# Shared HTTP session so repeated calls to api.npoint.io reuse the same
+# TLS connection instead of doing a fresh handshake every time
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=10))
+SESSION.headers.update({"Connection": "keep-alive"})
+
+# Persistent Chromium profile. Only the cookies and localStorage (i.e. the npoint
+# login) carry over - the resource-blocking route below turns off Playwright's HTTP
+# cache. Not cached in CI, since it holds a live session (see upload_jsons.yml).
+PROFILE_DIR = os.getenv("NPOINT_PROFILE_DIR", "/tmp/npoint-profile")
+
+# Trimmed Chromium flags for CI containers only (not the headed local run): avoid the tiny /dev/shm and skip
+# subsystems this script never uses
+CHROMIUM_ARGS = [
+    "--disable-dev-shm-usage",
+    "--no-sandbox",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-first-run",
+]
+
+# How many bins we create at the same time (one browser tab each)
+MAX_PARALLEL_BINS = 4
+
+# Selectors for the npoint pages we drive. If npoint changes its markup,
+# only this dict needs updating.
+SELECTORS = {
+    "new_button": 'role=button[name="+ New"]',  # lives in the dashboard navbar
+    "editor": '#brace-editor',  # Ace editor container, a very robust selector
+    "save_button": 'button:has-text("Save")',
+}
+
+# How content gets into the editor:
+#   "ace_api"   - set the Ace document directly (fastest, falls back to "keys")
+#   "clipboard" - copy to the clipboard and paste with Ctrl/Cmd+V. All tabs share
+#                 one clipboard, so copy+paste is serialized with CLIPBOARD_LOCK
+#                 (the parallel tabs take turns for that step)
+#   "keys"      - select all and insert the text as keyboard input
+PASTE_MODES = ("ace_api", "clipboard", "keys")
+PASTE_MODE = os.getenv("NPOINT_PASTE_MODE", "ace_api")
+
+# Held from writeText() until Ctrl/Cmd+V so one tab can't paste another tab's JSON
+CLIPBOARD_LOCK = asyncio.Lock()
+
+# Resource types we don't need to download while automating the site
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+def json_loads(data):
+    # Accepts str or bytes
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps_indented(obj):
+    # Pretty-print with 2-space indent (matches what we paste into the editor)
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+def is_pretty_printed(raw):
+    # Cheap check for JSON that is already indented (like our lesson files)
+    return raw.lstrip().startswith(("{\n  ", "[\n  "))
+
+def json_dumps_bytes(obj):
+    # Compact bytes for sending as an HTTP request body
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+def snapshot_file_sizes(paths):
+    # Checks existence with one os.scandir per parent directory (listing the whole
+    # directory). Getting the sizes still costs one stat() per matched file.
+    # Returns {normalized path: size in bytes} for files that exist.
+    wanted = {os.path.normpath(path) for path in paths}
+    sizes = {}
+    for directory in {os.path.dirname(path) or "." for path in wanted}:
+        try:
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            continue
+        for entry in entries:
+            entry_path = os.path.normpath(entry.path)
+            if entry_path in wanted and entry.is_file():
+                sizes[entry_path] = entry.stat().st_size
+    return sizes
+
+def save_response_matcher(bin_id):
+    # Matches the POST/PUT the editor's Save button sends for this one bin, so an
+    # unrelated npoint request can't end the wait before the real save lands
+    def is_save_response(response):
+        url = urlparse(response.url)
+        return (
+            response.request.method in ("POST", "PUT")
+            and url.hostname in ("api.npoint.io", "www.npoint.io")
+            and bin_id in url.path.split("/")
+        )
+    return is_save_response
+
+# Sets the whole Ace document in one call. Ace fires its own "change" event,
+# which is what npoint listens to for marking the doc as unsaved.
+SET_ACE_VALUE_JS = """(el, txt) => {
+    const editor = (el.env && el.env.editor) || window.ace.edit(el);
+    editor.setValue(txt, -1);
+}"""
+
+async def set_editor_text(page, editor, text, paste_mode):
+    # Replace the editor contents using one of PASTE_MODES
+    if paste_mode == "ace_api":
+        try:
+            await editor.evaluate(SET_ACE_VALUE_JS, text)
+            return
+        except Exception as e:
+            print(f"Ace API not available ({e}), typing into the editor instead...")
+            paste_mode = "keys"
+
+    # Click the main editor body to focus it, then Select All
+    await editor.click()
+    await page.keyboard.press("ControlOrMeta+a")
+
+    if paste_mode == "clipboard":
+        async with CLIPBOARD_LOCK:
+            # Pass the text as an argument so Playwright serializes it only once
+            await page.evaluate("(s) => navigator.clipboard.writeText(s)", text)
+            await page.keyboard.press("ControlOrMeta+v")
+    else:
+        # Clear existing text (Backspace) and type the new content
+        await page.keyboard.press("Backspace")
+        await page.keyboard.insert_text(text)
+
+def load_lesson(file_path):
+    # Reads a lesson file and returns (bin_title, bin_id_key, json_content_str).
+    # Raises on malformed JSON.
+    with open(file_path, 'r', encoding='utf-8') as f:
+        raw = f.read()
+
+    # Parse only to validate and read title/id. If the file is already
+    # indented on disk, paste it as-is instead of re-serializing it.
+    file_data = json_loads(raw)
+    json_content_str = raw if is_pretty_printed(raw) else json_dumps_indented(file_data)
+
+    bin_title = file_data.get("title", os.path.basename(file_path))
+    bin_id_key = file_data.get("id", os.path.splitext(os.path.basename(file_path))[0])
+    return bin_title, bin_id_key, json_content_str
+
+async def process_file(context, semaphore, file_path, lesson, selectors, paste_mode):
+    # Creates one bin for file_path in its own tab and returns its registry entry (or None)
+    async with semaphore:
+        print(f"--- Processing: {file_path} ---")
+
+        bin_title, bin_id_key, json_content_str = lesson
+        page = await context.new_page()
+
+        # Build the locators once per tab and reuse them below
+        new_btn = page.locator(selectors["new_button"])
+        editor = page.locator(selectors["editor"])
+        save_btn = page.locator(selectors["save_button"])
+        try:
+            # --- NEW CREATE FLOW ---
+            # Click "+ New" button to generate a new bin slug
+            print(f"[{file_path}] Creating new bin...")
+
+            if "/docs" not in page.url:
+                await page.goto("https://www.npoint.io/docs")
+
+            # Short probe instead of the default click timeout; only reload if it's really missing
+            try:
+                await new_btn.wait_for(state="visible", timeout=1500)
+            except:
+                print(f"[{file_path}] '+ New' button not found instantly, reloading dashboard...")
+                await page.goto("https://www.npoint.io/docs")
+            await new_btn.click()
+
+            # Wait for the URL to change to a specific bin slug (something longer than just /docs)
+            # We wait for the browser to settle on the new bin URL
+            await page.wait_for_url(lambda url: "/docs/" in url and len(url.split("/")) > 4, timeout=20000)
+
+            current_bin_url = page.url
+            print(f"[{file_path}] Draft initialized at: {current_bin_url}")
+
+            # --- EDIT CONTENT ---
+            print(f"[{file_path}] Filling editor...")
+            # Wait for the Ace editor container to be visible
+            await editor.wait_for(state="visible")
+
+            await set_editor_text(page, editor, json_content_str, paste_mode)
+
+            # Click Save
+            print(f"[{file_path}] Saving...")
+            # Wait for the save request to come back instead of sleeping
+            draft_bin_id = current_bin_url.rstrip("/").split("/")[-1]
+            async with page.expect_response(save_response_matcher(draft_bin_id), timeout=20000) as save_info:
+                await save_btn.click()
+            save_response = await save_info.value
+            if not save_response.ok:
+                raise Exception(f"Save failed with HTTP {save_response.status}")
+
+            # Capture URL (should differ if it was a "new" slug vs "saved" slug, but usually consistent on npoint)
+            generated_bin_id = page.url.split("/")[-1]
+            public_api_url = f"https://api.npoint.io/{generated_bin_id}"
+
+            print(f"CREATED: {bin_title} -> {public_api_url}")
+
+            return {
+                "id": bin_id_key,
+                "title": bin_title,
+                "url": public_api_url
+            }
+        except Exception as e:
+            print(f"ERROR processing {file_path}: {e}")
+            # The tab may have crashed or closed; don't let the screenshot take the whole run down
+            try:
+                await page.screenshot(path=f"debug_error_{bin_id_key}.png")
+            except Exception as screenshot_error:
+                print(f"Could not save screenshot for {file_path}: {screenshot_error}")
+            return None
+        finally:
+            try:
+                await page.close()
+            except Exception:
+                pass
+
+async def run(selectors=None, paste_mode=PASTE_MODE):
+    # Callers may override just some selectors; the rest come from SELECTORS
+    selectors = {**SELECTORS, **(selectors or {})}
+    if paste_mode not in PASTE_MODES:
+        raise ValueError(f"Unknown paste mode {paste_mode!r}, expected one of {PASTE_MODES}")
+
     # Get list of changed files passed from GitHub Action env var
     files_env = os.getenv("CHANGED_FILES", "")
     
@@ -30,189 +271,228 @@ def run():
     files_to_process = files_env.split()
     print(f"Processing files: {files_to_process}")
 
-    new_registry_entries = []
-    
-    # Detect if running in GitHub Actions (CI) or Locally
-    is_ci = os.getenv("GITHUB_ACTIONS") == "true"
+    # Validate everything before paying for a browser launch
+    file_sizes = snapshot_file_sizes(files_to_process)
+    existing_files = []
+    for file_path in files_to_process:
+        if not file_path.endswith(".json"):
+            print(f"Skipping {file_path} (Not a JSON file)")
+            continue
+        if os.path.normpath(file_path) not in file_sizes:
+            print(f"Skipping {file_path} (File not found on disk)")
+            continue
+        existing_files.append(file_path)
+
+    if not existing_files:
+        print("Nothing to do.")
+        return
+
+    # Smallest files first so quick wins (and obvious failures) show up early
+    existing_files.sort(key=lambda f: file_sizes[os.path.normpath(f)])
+
+    # Read and parse the files in the background while the browser starts and logs in.
+    # The with-block shuts the pool down on every exit path, including a failed login.
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        lesson_futures = {f: executor.submit(load_lesson, f) for f in existing_files}
+
+        # Detect if running in GitHub Actions (CI) or Locally
+        is_ci = os.getenv("GITHUB_ACTIONS") == "true"
     
-    # If Local: Headless=False (Show Browser), SlowMo=1000ms (Human speed)
-    # If CI: Headless=True (Hidden), SlowMo=0ms (Fastest)
-    headless_mode = is_ci
-    slow_mo_delay = 0 if is_ci else 1000
+        # If Local: Headless=False (Show Browser), SlowMo=1000ms (Human speed)
+        # If CI: Headless=True (Hidden), SlowMo=0ms (Fastest)
+        headless_mode = is_ci
+        slow_mo_delay = 0 if is_ci else 1000
 
-    print(f"Launching Browser (Headless: {headless_mode})...")
+        print(f"Launching Browser (Headless: {headless_mode})...")
 
-    with sync_playwright() as p:
-        # Launch browser with settings determined above
-        browser = p.chromium.launch(headless=headless_mode, slow_mo=slow_mo_delay)
-        
-        # FIX 1: Set a real User-Agent to avoid bot detection/white screens
-        context = browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            permissions=["clipboard-read", "clipboard-write"]
-        )
+        async with async_playwright() as p:
+            # Check before launching, since launching creates the profile directory
+            has_profile = os.path.isdir(PROFILE_DIR)
+
+            # Launch browser with settings determined above on the persistent profile, so a
+            # previous run's login is reused and every tab in this one context shares it.
+            # A real User-Agent avoids bot detection/white screens.
+            context = await p.chromium.launch_persistent_context(
+                user_data_dir=PROFILE_DIR,
+                headless=headless_mode,
+                slow_mo=slow_mo_delay,
+                args=CHROMIUM_ARGS if is_ci else [],
+                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+                permissions=["clipboard-read", "clipboard-write"]
+            )
         
-        # CRITICAL: Grant clipboard permissions for Headless mode to work with copy/paste
-        context.grant_permissions(['clipboard-read', 'clipboard-write'], origin='https://www.npoint.io')
+            # Skip images/fonts/media - we only need the login form and the editor.
+            # Stylesheets are kept so the login widget is laid out and clickable.
+            # Note: any route disables the HTTP cache, so the profile only saves us the login.
+            await context.route("**/*", lambda route: route.abort() if route.request.resource_type in BLOCKED_RESOURCE_TYPES else route.continue_())
+
+            # CRITICAL: Grant clipboard permissions for Headless mode to work with copy/paste
+            await context.grant_permissions(['clipboard-read', 'clipboard-write'], origin='https://www.npoint.io')
         
-        page = context.new_page()
+            # A persistent context already opens with one blank tab
+            page = context.pages[0] if context.pages else await context.new_page()
 
-        print("--- Step 1: Logging into npoint.io ---")
+            print("--- Step 1: Logging into npoint.io ---")
         
-        try:
-            # Go to Home Page
-            page.goto("https://www.npoint.io/", timeout=60000)
-            
-            # FIX 2: Wait for network to idle
-            try:
-                page.wait_for_load_state("networkidle", timeout=5000)
-            except:
-                pass 
-            
-            # Login Flow: Click Dropdown -> Fill Form -> Submit
-            print("Opening Login Dropdown...")
-            page.wait_for_selector('.login-dropdown-component', state="visible", timeout=20000)
-            page.click('.login-dropdown-component')
-
-            print("Entering credentials...")
-            # Updated selectors based on the .login-component container
-            page.wait_for_selector('.login-component', state="visible", timeout=10000)
-            
-            # Select the first input in the component (typically Email/User)
-            page.fill('.login-component input:first-of-type', EMAIL)
-            # Select the password input
-            page.fill('.login-component input[type="password"]', PASSWORD)
-            
-            print("Clicking Login...")
-            # Target the button strictly inside the login component
-            page.click('.login-component button.button.primary');
-            # Wait for redirection to the dashboard (/docs)
-            page.wait_for_url("**/docs", timeout=30000)
-            print("Logged in successfully.")
-            
-        except Exception as e:
-            print(f"!!! LOGIN FAILED !!!")
-            print(f"Current URL: {page.url}")
-            print(f"Page Title: {page.title()}")
-            # Take a screenshot to debug visual errors
-            page.screenshot(path="debug_error_login.png")
-            print("Saved screenshot to debug_error_login.png")
-            raise e
-
-        # --- Step 2: Loop through each new file and create a bin ---
-        for file_path in files_to_process:
-            if not os.path.exists(file_path):
-                print(f"Skipping {file_path} (File not found on disk)")
-                continue
+            # Reuse the profile's session if we have one. The URL alone isn't enough,
+            # since npoint may bounce logged-out users off /docs after the page loads;
+            # only trust the session once the logged-in "+ New" button shows up.
+            logged_in = False
+            if has_profile:
+                print("Found saved session, checking it...")
+                try:
+                    await page.goto("https://www.npoint.io/docs", timeout=60000)
+                    await page.locator(selectors["new_button"]).wait_for(state="visible", timeout=10000)
+                    logged_in = "/docs" in page.url
+                except Exception:
+                    logged_in = False
+                print("Saved session is valid, skipping login." if logged_in else "Saved session expired, logging in again...")
+
+            if not logged_in:
+                try:
+                    # Go to Home Page
+                    await page.goto("https://www.npoint.io/", timeout=60000)
+
+                    # Login Flow: Click Dropdown -> Fill Form -> Submit
+                    # (No "networkidle" wait - analytics can keep the network busy; the
+                    # dropdown being visible is what we actually need)
+                    print("Opening Login Dropdown...")
+                    await page.wait_for_selector('.login-dropdown-component', state="visible", timeout=20000)
+                    await page.click('.login-dropdown-component')
+
+                    print("Entering credentials...")
+                    # Updated selectors based on the .login-component container
+                    await page.wait_for_selector('.login-component', state="visible", timeout=10000)
             
-            print(f"--- Processing: {file_path} ---")
+                    # Select the first input in the component (typically Email/User)
+                    await page.fill('.login-component input:first-of-type', EMAIL)
+                    # Select the password input
+                    await page.fill('.login-component input[type="password"]', PASSWORD)
             
-            try:
-                with open(file_path, 'r') as f:
-                    file_data = json.load(f)
-                    json_content_str = json.dumps(file_data, indent=2)
-
-                bin_title = file_data.get("title", os.path.basename(file_path))
-                bin_id_key = file_data.get("id", os.path.splitext(os.path.basename(file_path))[0])
-
-                # --- NEW CREATE FLOW ---
-                # Click "+ New" button to generate a new bin slug
-                print("Creating new bin...")
-                
-                # We try to find the "+ New" button. It is usually in the navbar.
-                # If we can't find it, we force navigate to dashboard.
+                    print("Clicking Login...")
+                    # Target the button strictly inside the login component
+                    await page.click('.login-component button.button.primary');
+                    # Wait for redirection to the dashboard (/docs)
+                    await page.wait_for_url("**/docs", timeout=30000)
+                    print("Logged in successfully.")
+
+                except Exception as e:
+                    print(f"!!! LOGIN FAILED !!!")
+                    print(f"Current URL: {page.url}")
+                    print(f"Page Title: {await page.title()}")
+                    # Take a screenshot to debug visual errors
+                    await page.screenshot(path="debug_error_login.png")
+                    print("Saved screenshot to debug_error_login.png")
+                    raise e
+
+            # Best-effort: share the login cookies with SESSION for the registry API write.
+            # They are set by www.npoint.io (possibly host-only), so scope them to the parent
+            # domain or requests will never send them to api.npoint.io. npoint doesn't document
+            # whether its API accepts them; Step 3 checks the write and falls back to the editor.
+            for cookie in await context.cookies():
+                if cookie["domain"].lstrip(".").endswith("npoint.io"):
+                    SESSION.cookies.set(cookie["name"], cookie["value"], domain=".npoint.io", path=cookie["path"])
+
+            # Collect the parsed files; a malformed one stops us before any bin is created
+            lessons = {}
+            for file_path, future in lesson_futures.items():
                 try:
-                    page.click('button:has-text("+ New")', timeout=5000)
-                except:
-                    print("'+ New' button not found instantly, going to dashboard...")
-                    page.goto("https://www.npoint.io/docs")
-                    page.click('button:has-text("+ New")')
-
-                # Wait for the URL to change to a specific bin slug (something longer than just /docs)
-                # We wait for the browser to settle on the new bin URL
-                time.sleep(2) # Brief wait for the redirect to start
-                page.wait_for_url(lambda url: "/docs/" in url and len(url.split("/")) > 4, timeout=20000)
-                
-                current_bin_url = page.url
-                print(f"Draft initialized at: {current_bin_url}")
-
-                # --- EDIT CONTENT ---
-                # Click into the editor area
-                print("Focusing editor...")
-                # 2. Wait for the Ace editor container to be visible
-                # The HTML shows id="brace-editor", which is a very robust selector
-                page.wait_for_selector('#brace-editor', state="visible")
-
-                # 3. Click the main editor body to focus it
-                page.click('#brace-editor')
-
-                # Clear existing text (Select All + Backspace)
-                page.keyboard.press("ControlOrMeta+a")
-                page.keyboard.press("Backspace")
-                
-                page.keyboard.insert_text(json_content_str)
-                
-                # Click Save
-                print("Saving...")
-                page.click('button:has-text("Save")')
-                
-                # Wait for Save confirmation (usually button state change or toast)
-                # We'll wait a moment to ensure server sync
-                time.sleep(2)
-                
-                # Capture URL (should differ if it was a "new" slug vs "saved" slug, but usually consistent on npoint)
-                generated_bin_id = page.url.split("/")[-1]
-                public_api_url = f"https://api.npoint.io/{generated_bin_id}"
-                
-                print(f"CREATED: {bin_title} -> {public_api_url}")
-
-                new_registry_entries.append({
-                    "id": bin_id_key,
-                    "title": bin_title,
-                    "url": public_api_url
-                })
-            except Exception as e:
-                print(f"ERROR processing {file_path}: {e}")
-                page.screenshot(path=f"debug_error_{bin_id_key}.png")
-
-        # --- Step 3: Update Registry (Only if we have new entries) ---
-        if new_registry_entries:
-            print("--- Step 3: Updating Registry ---")
+                    # Await instead of .result() so the Playwright connection keeps being serviced
+                    lessons[file_path] = await asyncio.wrap_future(future)
+                except Exception as e:
+                    print(f"!!! INVALID JSON: {file_path}: {e}")
+                    raise e
+
+            # --- Step 2: Create a bin for each new file (a few tabs at a time) ---
+            semaphore = asyncio.Semaphore(MAX_PARALLEL_BINS)
+            # return_exceptions so one broken tab can't cancel the others and leave
+            # their already-created bins out of the registry
+            results = await asyncio.gather(
+                *(process_file(context, semaphore, f, lessons[f], selectors, paste_mode) for f in existing_files),
+                return_exceptions=True
+            )
+            for file_path, result in zip(existing_files, results):
+                if isinstance(result, Exception):
+                    print(f"ERROR processing {file_path}: {result}")
+            # Keep entries in the same order the files were processed in
+            new_registry_entries = [entry for entry in results if isinstance(entry, dict)]
+
+            # --- Step 3: Update Registry (Only if we have new entries) ---
+            if new_registry_entries:
+                print("--- Step 3: Updating Registry ---")
             
-            # Fetch existing registry
-            registry_api_url = f"https://api.npoint.io/{REGISTRY_BIN_ID}"
-            try:
-                current_registry = requests.get(registry_api_url).json()
+                # Fetch existing registry. If we can't, stop here: writing without it
+                # would wipe every earlier lesson from the registry.
+                registry_api_url = f"https://api.npoint.io/{REGISTRY_BIN_ID}"
+                try:
+                    registry_response = await asyncio.to_thread(SESSION.get, registry_api_url, timeout=10)
+                    registry_response.raise_for_status()
+                except requests.RequestException as e:
+                    print(f"!!! REGISTRY FETCH FAILED, NOT UPDATING IT: {e}")
+                    print(f"Entries that still need adding: {new_registry_entries}")
+                    raise e
+
+                # An unreadable body (e.g. an HTML error page) is a failure too; only a
+                # valid JSON value that isn't a list gets treated as an empty registry
+                try:
+                    current_registry = json_loads(registry_response.content)
+                except ValueError as e:
+                    print(f"!!! REGISTRY IS NOT VALID JSON, NOT UPDATING IT: {e}")
+                    print(f"Entries that still need adding: {new_registry_entries}")
+                    raise e
                 if not isinstance(current_registry, list):
                     current_registry = []
-            except:
-                current_registry = []
 
-            # Update logic
-            new_ids = [entry['id'] for entry in new_registry_entries]
-            updated_registry = [item for item in current_registry if item.get('id') not in new_ids]
-            updated_registry.extend(new_registry_entries)
+                # Update logic: key by id so new entries replace old ones in a single pass
+                merged = {item['id']: item for item in current_registry if isinstance(item, dict) and 'id' in item}
+                merged.update({entry['id']: entry for entry in new_registry_entries})
+                updated_registry = list(merged.values())
 
-            # Navigate to Registry Edit Page
-            registry_edit_url = f"https://www.npoint.io/docs/{REGISTRY_BIN_ID}"
-            page.goto(registry_edit_url)
-            
-            # Edit Registry
-            updated_registry_str = json.dumps(updated_registry, indent=2)
-            page.click('#brace-editor')
-            # Clear existing text (Select All + Backspace)
-            page.keyboard.press("ControlOrMeta+a")
-            page.keyboard.press("Backspace")    
-            page.keyboard.insert_text(updated_registry_str)
-            
-            # Save
-            page.click('button:has-text("Save")')
-            time.sleep(2) 
-            print("Registry Updated Successfully!")
-        else:
-            print("No new entries created, skipping registry update.")
+                # Best-effort: try a single HTTP write first with the login cookies on SESSION.
+                # The blocking requests calls run in a thread so the event loop stays free.
+                saved_via_api = False
+                try:
+                    api_response = await asyncio.to_thread(
+                        SESSION.post,
+                        registry_api_url,
+                        data=json_dumps_bytes(updated_registry),
+                        headers={"Content-Type": "application/json"},
+                        timeout=10
+                    )
+                    if api_response.ok:
+                        # A 2xx alone isn't proof - an anonymous POST could be accepted and
+                        # ignored. Read the registry back and only trust the write if it stuck.
+                        check_response = await asyncio.to_thread(SESSION.get, registry_api_url, timeout=10)
+                        saved_via_api = check_response.ok and json_loads(check_response.content) == updated_registry
+                        if not saved_via_api:
+                            print("Registry API write didn't stick, falling back to the editor...")
+                    else:
+                        print(f"Registry API write returned HTTP {api_response.status_code}, falling back to the editor...")
+                except Exception as e:
+                    print(f"Registry API write failed ({e}), falling back to the editor...")
+
+                if not saved_via_api:
+                    # Navigate to Registry Edit Page
+                    registry_edit_url = f"https://www.npoint.io/docs/{REGISTRY_BIN_ID}"
+                    await page.goto(registry_edit_url)
+
+                    # Edit Registry
+                    updated_registry_str = json_dumps_indented(updated_registry)
+                    editor = page.locator(selectors["editor"])
+                    await editor.wait_for(state="visible")
+                    await set_editor_text(page, editor, updated_registry_str, paste_mode)
+
+                    # Save
+                    async with page.expect_response(save_response_matcher(REGISTRY_BIN_ID), timeout=20000) as save_info:
+                        await page.locator(selectors["save_button"]).click()
+                    save_response = await save_info.value
+                    if not save_response.ok:
+                        raise Exception(f"Registry save failed with HTTP {save_response.status}")
+                print("Registry Updated Successfully!")
+            else:
+                print("No new entries created, skipping registry update.")
 
-        browser.close()
+            await context.close()
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    asyncio.run(run())